@@ -1,5 +1,99 @@
+import threading
+
 import numpy as np
 
+try:
+    import numexpr as ne
+except ImportError:  # pragma: no cover - numexpr is optional
+    ne = None
+
+
+# Scratch buffer shared by the mask functions, grown geometrically so the
+# repeated calls of a pipeline stop paying allocation and page-zeroing
+# costs. uint8-backed and thread-local, so concurrent pipelines never
+# overwrite each other's masks; handed out as a zero-copy bool view.
+_MASK_LOCAL = threading.local()
+
+
+def _get_mask(n: int) -> np.ndarray:
+    """
+    Get a reusable boolean mask buffer of length n.
+
+    The returned view aliases a thread-local scratch buffer: it is only
+    valid until the next mask function call on the same thread, so
+    callers must consume it (or copy it) before computing another mask.
+
+    Parameters
+    ----------
+    n : int
+        The required mask length.
+
+    Returns
+    -------
+    np.ndarray
+        A writable boolean view of length n.
+    """
+    buf = getattr(_MASK_LOCAL, "buf", None)
+
+    if buf is None or buf.size < n:
+        buf = np.empty(max(n, 0 if buf is None else 2 * buf.size), dtype=np.uint8)
+        _MASK_LOCAL.buf = buf
+
+    return buf[:n].view(np.bool_)
+
+
+def _degrees_at_least(degrees: np.ndarray, thresholds: np.ndarray) -> np.ndarray:
+    """
+    Evaluate ``degrees >= thresholds`` in a single fused pass.
+
+    With numexpr available the comparison is evaluated in one blocked
+    sweep over both operands; otherwise it falls back to the plain ufunc.
+    The result is written into the shared mask buffer.
+
+    Parameters
+    ----------
+    degrees : np.ndarray
+        The degrees of the vertices in the graph.
+    thresholds : np.ndarray
+        The per-vertex thresholds to compare against.
+
+    Returns
+    -------
+    np.ndarray
+        A boolean mask marking the vertices to keep.
+    """
+    mask = _get_mask(degrees.size)
+
+    if ne is not None:
+        ne.evaluate("degrees >= thresholds", out=mask)
+    else:
+        np.greater_equal(degrees, thresholds, out=mask)
+
+    return mask
+
+
+def _class_codes(y: np.ndarray) -> np.ndarray:
+    """
+    Get the integer class codes of the labels.
+
+    Boolean labels are already 0/1 codes, so the two-class case skips the
+    O(n log n) sort inside np.unique with a zero-copy reinterpret.
+
+    Parameters
+    ----------
+    y : np.ndarray
+        The labels corresponding to the data points.
+
+    Returns
+    -------
+    np.ndarray
+        The integer class codes of the labels.
+    """
+    if y.dtype == np.bool_:
+        return y.view(np.int8)
+
+    return np.unique(y, return_inverse=True)[1]
+
 
 def filter_by_degree(
     X: np.ndarray, y: np.ndarray, degrees: np.ndarray, filter: str
@@ -31,16 +125,152 @@ def filter_by_degree(
         The filtered data points and their corresponding labels.
     """
 
+    mask = _mask_by_degree(y, degrees, filter)
+
+    return X[mask], y[mask]
+
+
+def _mask_by_degree(
+    y: np.ndarray,
+    degrees: np.ndarray,
+    filter: str,
+    inv: np.ndarray | None = None,
+) -> np.ndarray:
+    """
+    Compute the boolean keep-mask for a degree filter criterion.
+
+    Mask-level variant of `filter_by_degree`: no data rows are copied, so
+    callers holding index sets can apply the mask themselves and slice
+    the feature matrix only once at the end of the pipeline.
+
+    Parameters
+    ----------
+    y : np.ndarray
+        The labels corresponding to the data points.
+    degrees : np.ndarray
+        The degrees of the vertices in the graph.
+    filter : str
+        The filter criterion to apply ('class-average', 'interclass-average', 'zero').
+    inv : np.ndarray | None
+        Precomputed class codes of the labels, to avoid re-deriving them
+        on every call of a pipeline.
+
+    Returns
+    -------
+    np.ndarray
+        A boolean mask marking the vertices to keep.
+    """
+
+    if inv is not None and inv.dtype == np.bool_:
+        inv = inv.view(np.int8)
+
     if filter == "class-average":
-        return class_average_filter(X, y, degrees)
+        return _class_average_mask(y, degrees, inv)
     elif filter == "interclass-average":
-        return interclass_average_filter(X, y, degrees)
+        return _interclass_average_mask(y, degrees, inv)
     elif filter == "zero":
-        return zero_degree_filter(X, y, degrees)
+        return _zero_mask(degrees)
     else:
         raise ValueError(f"Unknown filter method: {filter}")
 
 
+def _class_average_mask(
+    y: np.ndarray, degrees: np.ndarray, inv: np.ndarray | None = None
+) -> np.ndarray:
+    """
+    Mark vertices with degree at or above the average degree of their class.
+
+    Parameters
+    ----------
+    y : np.ndarray
+        The labels corresponding to the data points.
+    degrees : np.ndarray
+        The degrees of the vertices in the graph.
+    inv : np.ndarray | None
+        Precomputed class codes of the labels.
+
+    Returns
+    -------
+    np.ndarray
+        A boolean mask marking the vertices to keep.
+    """
+    if inv is None:
+        inv = _class_codes(y)
+
+    # Per-class average degree in a single segmented pass. Codes absent
+    # from this subset have counts == 0; their threshold entry is never
+    # gathered, so the division only needs guarding against the warning.
+    sums = np.bincount(inv, weights=degrees)
+    counts = np.bincount(inv)
+    class_avg_degree = sums / np.maximum(counts, 1)
+
+    # Keep vertices with degree >= the average of their class
+    return _degrees_at_least(degrees, class_avg_degree[inv])
+
+
+def _interclass_average_mask(
+    y: np.ndarray, degrees: np.ndarray, inv: np.ndarray | None = None
+) -> np.ndarray:
+    """
+    Mark vertices with degree at or above the average degree of the
+    vertices of the same class that are connected to interclass edges.
+
+    Parameters
+    ----------
+    y : np.ndarray
+        The labels corresponding to the data points.
+    degrees : np.ndarray
+        The degrees of the vertices in the graph.
+    inv : np.ndarray | None
+        Precomputed class codes of the labels.
+
+    Returns
+    -------
+    np.ndarray
+        A boolean mask marking the vertices to keep.
+    """
+    if inv is None:
+        inv = _class_codes(y)
+
+    # Vertices connected to interclass edges (degree < 1.0)
+    interclass = degrees < 1.0
+
+    # Per-class average degree over interclass vertices in a single
+    # segmented pass
+    sums = np.bincount(inv, weights=np.where(interclass, degrees, 0.0))
+    counts = np.bincount(inv, weights=interclass)
+
+    # Classes without interclass connections keep all of their vertices
+    thresholds = np.where(counts > 0, sums / np.maximum(counts, 1), -np.inf)
+
+    # Keep vertices with degree >= the interclass average of their class
+    return _degrees_at_least(degrees, thresholds[inv])
+
+
+def _zero_mask(degrees: np.ndarray) -> np.ndarray:
+    """
+    Mark vertices with degree away from zero.
+
+    Parameters
+    ----------
+    degrees : np.ndarray
+        The degrees of the vertices in the graph.
+
+    Returns
+    -------
+    np.ndarray
+        A boolean mask marking the vertices to keep.
+    """
+    mask = _get_mask(degrees.size)
+
+    if ne is not None:
+        ne.evaluate("degrees > 1e-6", out=mask)
+    else:
+        np.greater(degrees, 1e-6, out=mask)
+
+    return mask
+
+
 def class_average_filter(
     X: np.ndarray, y: np.ndarray, degrees: np.ndarray
 ) -> tuple[np.ndarray, np.ndarray]:
@@ -61,19 +291,7 @@ def class_average_filter(
     tuple[np.ndarray, np.ndarray]
         The filtered data points and their corresponding labels.
     """
-    mask = np.zeros(len(X), dtype=bool)
-
-    # Get unique classes
-    unique_classes = np.unique(y)
-
-    # For each class, calculate average degree and filter
-    for class_label in unique_classes:
-        class_mask = y == class_label
-        class_degrees = degrees[class_mask]
-        class_avg_degree = np.mean(class_degrees)
-
-        # Keep vertices with degree >= class average
-        mask[class_mask] = class_degrees >= class_avg_degree
+    mask = _class_average_mask(y, degrees)
 
     return X[mask], y[mask]
 
@@ -99,28 +317,7 @@ def interclass_average_filter(
     tuple[np.ndarray, np.ndarray]
         The filtered data points and their corresponding labels.
     """
-    mask = np.zeros(len(X), dtype=bool)
-
-    # Get unique classes
-    unique_classes = np.unique(y)
-
-    # For each class, calculate average degree of vertices connected to interclass edges
-    for class_label in unique_classes:
-        class_mask = y == class_label
-        class_degrees = degrees[class_mask]
-        
-        # Find vertices connected to interclass edges (degree < 1.0)
-        interclass_mask = class_degrees < 1.0
-        
-        if np.any(interclass_mask):
-            # Calculate average degree of vertices with interclass connections
-            interclass_avg_degree = np.mean(class_degrees[interclass_mask])
-            
-            # Keep vertices with degree >= interclass average
-            mask[class_mask] = class_degrees >= interclass_avg_degree
-        else:
-            # If no interclass connections, keep all vertices of this class
-            mask[class_mask] = True
+    mask = _interclass_average_mask(y, degrees)
 
     return X[mask], y[mask]
 
@@ -145,6 +342,6 @@ def zero_degree_filter(
     tuple[np.ndarray, np.ndarray]
         The filtered data points and their corresponding labels.
     """
-    mask = degrees > 1e-6
+    mask = _zero_mask(degrees)
 
     return X[mask], y[mask]
@@ -1,5 +1,219 @@
 import numpy as np
 
+try:
+    from numba import njit, prange
+except ImportError:  # pragma: no cover - numba is optional
+    njit = None
+
+try:
+    import scipy.sparse as sp
+except ImportError:  # pragma: no cover - scipy is optional
+    sp = None
+
+
+def _csr_neighbor_counts(
+    ADJ: "sp.csr_matrix", inv: np.ndarray
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Count total and same-class neighbors per vertex from a CSR adjacency.
+
+    The CSR indices form an edge list, so both counts are O(E) vector
+    operations instead of O(n^2) row reductions - the natural fit for the
+    sparse proximity graphs produced upstream.
+
+    Parameters
+    ----------
+    ADJ : sp.csr_matrix
+        The adjacency matrix in CSR format.
+    inv : np.ndarray
+        The integer class codes of the vertices.
+
+    Returns
+    -------
+    tuple[np.ndarray, np.ndarray]
+        The total and same-class neighbor counts per vertex.
+    """
+    n = ADJ.shape[0]
+    indptr, indices = ADJ.indptr, ADJ.indices
+
+    total = np.diff(indptr)
+    src = np.repeat(np.arange(n), total)
+    same_edge = inv[src] == inv[indices]
+    same_count = np.bincount(src[same_edge], minlength=n)
+
+    return total, same_count
+
+
+def _dense_neighbor_counts(
+    ADJ: np.ndarray, inv: np.ndarray
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Count total and same-class neighbors per vertex from a dense adjacency.
+
+    The adjacency is flattened to an edge list with np.nonzero and the
+    class codes are compared per edge, so apart from the nonzero scan no
+    n-by-n intermediate is ever allocated.
+
+    Parameters
+    ----------
+    ADJ : np.ndarray
+        The boolean adjacency matrix.
+    inv : np.ndarray
+        The integer class codes of the vertices.
+
+    Returns
+    -------
+    tuple[np.ndarray, np.ndarray]
+        The total and same-class neighbor counts per vertex.
+    """
+    n = ADJ.shape[0]
+    src, dst = np.nonzero(ADJ)
+
+    total = np.bincount(src, minlength=n)
+    same_edge = inv[src] == inv[dst]
+    same_count = np.bincount(src[same_edge], minlength=n)
+
+    return total, same_count
+
+
+def _matmul_neighbor_counts(
+    ADJ: np.ndarray, inv: np.ndarray, n_classes: int
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Count total and same-class neighbors per vertex through BLAS.
+
+    With a one-hot class matrix Y, the same-class count per vertex is the
+    row sum of (ADJ @ Y) * Y, so the dominant O(n^2) term runs inside an
+    optimized GEMM. Worthwhile only while the class count stays small,
+    since the matmul is O(n^2 * C).
+
+    Parameters
+    ----------
+    ADJ : np.ndarray
+        The boolean adjacency matrix.
+    inv : np.ndarray
+        The integer class codes of the vertices.
+    n_classes : int
+        The number of classes.
+
+    Returns
+    -------
+    tuple[np.ndarray, np.ndarray]
+        The total and same-class neighbor counts per vertex.
+    """
+    n = ADJ.shape[0]
+
+    onehot = np.zeros((n, n_classes), dtype=np.float32)
+    onehot[np.arange(n), inv.view(np.int8) if inv.dtype == np.bool_ else inv] = 1.0
+
+    A = ADJ.astype(np.float32)
+    total = A.sum(axis=1).astype(np.intp)
+    same_count = np.rint(((A @ onehot) * onehot).sum(axis=1)).astype(np.intp)
+
+    return total, same_count
+
+
+if njit is not None:
+
+    @njit(parallel=True, cache=True)
+    def _neighbor_counts_jit(
+        ADJ: np.ndarray, inv: np.ndarray
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Count total and same-class neighbors per vertex in a single sweep.
+
+        No n-by-n comparison matrix is ever materialized: each row is
+        scanned once against the label codes. Rows are processed in
+        parallel and only scalar indexing is used.
+
+        Parameters
+        ----------
+        ADJ : np.ndarray
+            The boolean adjacency matrix.
+        inv : np.ndarray
+            The integer class codes of the vertices.
+
+        Returns
+        -------
+        tuple[np.ndarray, np.ndarray]
+            The total and same-class neighbor counts per vertex.
+        """
+        n = ADJ.shape[0]
+        total = np.zeros(n, dtype=np.intp)
+        same_count = np.zeros(n, dtype=np.intp)
+
+        for i in prange(n):
+            code = inv[i]
+            for j in range(n):
+                if ADJ[i, j]:
+                    total[i] += 1
+                    if inv[j] == code:
+                        same_count[i] += 1
+
+        return total, same_count
+
+
+def _interclass_indices(
+    ADJ: np.ndarray, y: np.ndarray, inv: np.ndarray | None = None
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Get the indices and degrees of vertices incident to interclass edges.
+
+    Index-level variant of `get_interclass_vertices`: no feature rows are
+    copied, so callers can thread index sets through the whole pipeline
+    and slice X once at the end.
+
+    Parameters
+    ----------
+    ADJ : np.ndarray
+        The adjacency matrix representing the graph.
+    y : np.ndarray
+        The labels corresponding to the data points.
+    inv : np.ndarray | None
+        Precomputed class codes of the labels, to avoid re-deriving them
+        on every call of a pipeline.
+
+    Returns
+    -------
+    tuple[np.ndarray, np.ndarray]
+        The indices of the vertices that connect different classes and
+        their degrees.
+    """
+
+    y = np.asarray(y)
+
+    # Binary problems get boolean codes: already 0/1 for bool labels, and
+    # for any other two-class labels the bool cast keeps the per-edge
+    # gathers at one byte per vertex instead of a full integer.
+    if inv is None:
+        if y.dtype == np.bool_:
+            inv = y
+        else:
+            classes, inv = np.unique(y, return_inverse=True)
+            inv = inv.astype(np.bool_ if classes.size == 2 else np.intp)
+
+    if sp is not None and sp.issparse(ADJ):
+        total, same_count = _csr_neighbor_counts(ADJ.tocsr(), inv)
+    else:
+        ADJ = np.asarray(ADJ, dtype=bool)
+        if njit is not None:
+            total, same_count = _neighbor_counts_jit(ADJ, inv)
+        else:
+            if inv.dtype == np.bool_:
+                n_classes = 2
+            else:
+                n_classes = int(inv.max()) + 1 if inv.size else 0
+
+            if 0 < n_classes <= 32:
+                total, same_count = _matmul_neighbor_counts(ADJ, inv, n_classes)
+            else:
+                total, same_count = _dense_neighbor_counts(ADJ, inv)
+
+    keep = (total > 0) & (same_count < total)
+    degrees = same_count[keep] / total[keep]
+
+    return np.flatnonzero(keep), degrees
+
 
 def get_interclass_vertices(
     X: np.ndarray, ADJ: np.ndarray, y: np.ndarray
@@ -29,29 +243,8 @@ def get_interclass_vertices(
     """
 
     X = np.asarray(X)
-    ADJ = np.asarray(ADJ)
     y = np.asarray(y)
 
-    n = X.shape[0]
-    degrees = -1 * np.ones(
-        n, dtype=float
-    )  # Initialize degrees to -1 to indicate uncalculated
-    vertices = []
-    class_labels = []
-
-    for i in range(n):
-        neighbors = np.where(ADJ[i])[0]
-        if len(neighbors) == 0:
-            continue
-
-        same_class_neighbors = neighbors[y[neighbors] == y[i]]
-        different_class_neighbors = neighbors[y[neighbors] != y[i]]
-
-        if len(different_class_neighbors) > 0:
-            vertices.append(X[i])
-            class_labels.append(y[i])
-            degrees[i] = len(same_class_neighbors) / len(neighbors)
-
-    degrees = degrees[degrees != -1]
+    keep, degrees = _interclass_indices(ADJ, y)
 
-    return np.array(vertices), np.array(class_labels), degrees
+    return X[keep], y[keep], degrees
@@ -1,7 +1,8 @@
 import matplotlib.pyplot as plt
+import numpy as np
 from sklearn.datasets import make_blobs
 
-from support_vectors import support_vectors
+from support_vectors import _GRAPH_METHODS, _support_vectors_from_adj
 
 
 def test_support_vectors():
@@ -11,14 +12,21 @@ def test_support_vectors():
     and highlighted support vectors.
     """
 
-    # Generate synthetic data
+    # Generate synthetic data, pre-cast once for the whole test matrix
     X, y = make_blobs(n_samples=200, n_features=2, cluster_std=2)[0:2]
+    X = np.ascontiguousarray(X, dtype=np.float32)
 
     # Define test parameters
     graph_methods = ["gabriel", "relative_neighborhood", "urquhart"]
     filter_methods = ["two-pass", "one-pass", "one-pass"]
     one_step_criteria = [None, "interclass-average", "zero"]
 
+    # Build each graph once and share it across the three filter variants
+    adjacencies = {
+        graph_method: _GRAPH_METHODS[graph_method](X)
+        for graph_method in graph_methods
+    }
+
     # Create subplot layout
     fig, axes = plt.subplots(3, 3, figsize=(15, 15))
     fig.suptitle("Support Vector Selection: All Methods Comparison")
@@ -33,15 +41,19 @@ def test_support_vectors():
             title = ""
 
             try:
-                # Get support vectors
+                # Get support vectors from the shared adjacency
                 if filter_method == "two-pass":
-                    X_support, y_support = support_vectors(
-                        X, y, graph_method, filter_method, ""
+                    X_support, y_support = _support_vectors_from_adj(
+                        X, y, adjacencies[graph_method], filter_method, ""
                     )
                     title = f"{graph_method.title()}\nTwo-Pass"
                 else:
-                    X_support, y_support = support_vectors(
-                        X, y, graph_method, filter_method, one_step_criterion
+                    X_support, y_support = _support_vectors_from_adj(
+                        X,
+                        y,
+                        adjacencies[graph_method],
+                        filter_method,
+                        one_step_criterion,
                     )
                     title = f"{graph_method.title()}\nOne-Pass ({one_step_criterion})"
 
@@ -90,13 +102,21 @@ def test_support_vectors():
         ):
             try:
                 if filter_method == "two-pass":
-                    X_support, y_support = support_vectors(
-                        X, y, graph_method, filter_method, "interclass-average"
+                    X_support, y_support = _support_vectors_from_adj(
+                        X,
+                        y,
+                        adjacencies[graph_method],
+                        filter_method,
+                        "interclass-average",
                     )
                     method_name = "Two-Pass"
                 else:
-                    X_support, y_support = support_vectors(
-                        X, y, graph_method, filter_method, one_step_criterion
+                    X_support, y_support = _support_vectors_from_adj(
+                        X,
+                        y,
+                        adjacencies[graph_method],
+                        filter_method,
+                        one_step_criterion,
                     )
                     method_name = f"One-Pass ({one_step_criterion})"
 